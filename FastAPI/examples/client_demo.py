@@ -17,13 +17,34 @@ class TodoClient:
 
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
+        # A single pooled client keeps connections alive across requests
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=10.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=30,
+            ),
+        )
+
+    async def __aenter__(self) -> "TodoClient":
+        """Enter the async context, returning the client itself."""
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Close pooled connections when leaving the async context."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client and its pooled connections."""
+        await self._client.aclose()
 
     async def health_check(self) -> dict:
         """Check if the API is healthy."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.base_url}/health")
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.get("/health")
+        response.raise_for_status()
+        return response.json()
 
     async def create_todo(
         self,
@@ -40,10 +61,9 @@ class TodoClient:
             "completed": completed,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f"{self.base_url}/todos", json=todo_data)
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.post("/todos", json=todo_data)
+        response.raise_for_status()
+        return response.json()
 
     async def get_todos(
         self,
@@ -60,179 +80,177 @@ class TodoClient:
         if priority is not None:
             params["priority"] = priority
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.base_url}/todos", params=params)
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.get("/todos", params=params)
+        response.raise_for_status()
+        return response.json()
 
-    async def get_todo(self, todo_id: UUID) -> dict:
+    async def get_todo(self, todo_id: UUID | str) -> dict:
         """Get a specific todo by ID."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.base_url}/todos/{todo_id}")
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.get(f"/todos/{todo_id}")
+        response.raise_for_status()
+        return response.json()
 
-    async def update_todo(self, todo_id: UUID, **updates) -> dict:
+    async def update_todo(self, todo_id: UUID | str, **updates) -> dict:
         """Update an existing todo."""
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                f"{self.base_url}/todos/{todo_id}", json=updates
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.put(f"/todos/{todo_id}", json=updates)
+        response.raise_for_status()
+        return response.json()
 
-    async def delete_todo(self, todo_id: UUID) -> bool:
+    async def delete_todo(self, todo_id: UUID | str) -> bool:
         """Delete a todo item."""
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(f"{self.base_url}/todos/{todo_id}")
-            return response.status_code == 204
+        response = await self._client.delete(f"/todos/{todo_id}")
+        return response.status_code == 204
 
-    async def toggle_todo(self, todo_id: UUID) -> dict:
+    async def toggle_todo(self, todo_id: UUID | str) -> dict:
         """Toggle the completion status of a todo."""
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(f"{self.base_url}/todos/{todo_id}/toggle")
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.patch(f"/todos/{todo_id}/toggle")
+        response.raise_for_status()
+        return response.json()
 
     async def get_stats(self) -> dict:
         """Get todo statistics."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.base_url}/todos/stats")
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.get("/todos/stats")
+        response.raise_for_status()
+        return response.json()
 
 
 async def demo_workflow():
     """Demonstrate a complete workflow using the Todo API."""
-    client = TodoClient()
-
-    print("🚀 FastAPI Client Demo Workflow")
-    print("=" * 40)
-
-    # 1. Check API health
-    print("\n1. Checking API health...")
-    health = await client.health_check()
-    print(f"✅ API Status: {health['status']}")
-    print(f"📊 Total Todos: {health['total_todos']}")
-
-    # 2. Create some todos
-    print("\n2. Creating todos...")
-    todos_to_create = [
-        {
-            "title": "Set up development environment",
-            "description": "Install Python, UV, and FastAPI",
-            "priority": 5,
-            "completed": True,
-        },
-        {
-            "title": "Build Todo API",
-            "description": "Create a comprehensive FastAPI application",
-            "priority": 4,
-            "completed": False,
-        },
-        {
-            "title": "Write comprehensive tests",
-            "description": "Implement unit and integration tests",
-            "priority": 3,
-            "completed": False,
-        },
-    ]
-
-    created_todos = []
-    for todo_data in todos_to_create:
-        todo = await client.create_todo(**todo_data)
-        created_todos.append(todo)
-        print(f"✅ Created: {todo['title']} (ID: {todo['id']})")
-
-    # 3. List all todos
-    print("\n3. Listing all todos...")
-    all_todos = await client.get_todos()
-    print(f"📝 Found {len(all_todos)} todos total")
-
-    # 4. Filter todos
-    print("\n4. Filtering todos...")
-    completed_todos = await client.get_todos(completed=True)
-    print(f"✅ Completed todos: {len(completed_todos)}")
-
-    high_priority_todos = await client.get_todos(priority=5)
-    print(f"🔥 High priority todos: {len(high_priority_todos)}")
-
-    # 5. Update a todo
-    print("\n5. Updating a todo...")
-    todo_to_update = created_todos[1]  # The "Build Todo API" todo
-    updated_todo = await client.update_todo(
-        UUID(todo_to_update["id"]),
-        description="Create a production-ready FastAPI application with tests",
-        priority=5,
-    )
-    print(f"📝 Updated: {updated_todo['title']}")
-    print(f"   New priority: {updated_todo['priority']}")
-
-    # 6. Toggle completion
-    print("\n6. Toggling todo completion...")
-    toggled_todo = await client.toggle_todo(UUID(todo_to_update["id"]))
-    status = "completed" if toggled_todo["completed"] else "pending"
-    print(f"🔄 Toggled todo to: {status}")
-
-    # 7. Get statistics
-    print("\n7. Getting statistics...")
-    stats = await client.get_stats()
-    print(f"📊 Total: {stats['total_todos']}")
-    print(f"✅ Completed: {stats['completed_todos']}")
-    print(f"⏳ Pending: {stats['pending_todos']}")
-
-    for priority in range(1, 6):
-        count = stats.get(f"priority_{priority}", 0)
-        if count > 0:
-            print(f"🎯 Priority {priority}: {count} todos")
-
-    # 8. Get specific todo
-    print("\n8. Getting specific todo...")
-    specific_todo = await client.get_todo(UUID(created_todos[0]["id"]))
-    print(f"📋 Retrieved: {specific_todo['title']}")
-
-    # 9. Delete a todo
-    print("\n9. Deleting a todo...")
-    success = await client.delete_todo(UUID(created_todos[2]["id"]))
-    if success:
-        print(f"🗑️ Deleted: {created_todos[2]['title']}")
-
-    # 10. Final statistics
-    print("\n10. Final statistics...")
-    final_stats = await client.get_stats()
-    print(f"📊 Final total: {final_stats['total_todos']} todos")
-
-    print("\n🎉 Demo workflow completed successfully!")
+    async with TodoClient() as client:
+        print("🚀 FastAPI Client Demo Workflow")
+        print("=" * 40)
+
+        # 1. Check API health
+        print("\n1. Checking API health...")
+        health = await client.health_check()
+        print(f"✅ API Status: {health['status']}")
+        print(f"📊 Total Todos: {health['total_todos']}")
+
+        # 2. Create some todos
+        print("\n2. Creating todos...")
+        todos_to_create = [
+            {
+                "title": "Set up development environment",
+                "description": "Install Python, UV, and FastAPI",
+                "priority": 5,
+                "completed": True,
+            },
+            {
+                "title": "Build Todo API",
+                "description": "Create a comprehensive FastAPI application",
+                "priority": 4,
+                "completed": False,
+            },
+            {
+                "title": "Write comprehensive tests",
+                "description": "Implement unit and integration tests",
+                "priority": 3,
+                "completed": False,
+            },
+        ]
+
+        # gather() returns results in submission order
+        created_todos = await asyncio.gather(
+            *(client.create_todo(**todo_data) for todo_data in todos_to_create)
+        )
+        print(
+            "\n".join(
+                f"✅ Created: {todo['title']} (ID: {todo['id']})"
+                for todo in created_todos
+            )
+        )
+
+        # 3. List all todos
+        print("\n3. Listing all todos...")
+        all_todos = await client.get_todos()
+        print(f"📝 Found {len(all_todos)} todos total")
+
+        # 4. Filter todos
+        print("\n4. Filtering todos...")
+        completed_todos = await client.get_todos(completed=True)
+        print(f"✅ Completed todos: {len(completed_todos)}")
+
+        high_priority_todos = await client.get_todos(priority=5)
+        print(f"🔥 High priority todos: {len(high_priority_todos)}")
+
+        # 5. Update a todo
+        print("\n5. Updating a todo...")
+        todo_to_update = created_todos[1]  # The "Build Todo API" todo
+        updated_todo = await client.update_todo(
+            todo_to_update["id"],
+            description="Create a production-ready FastAPI application with tests",
+            priority=5,
+        )
+        print(f"📝 Updated: {updated_todo['title']}")
+        print(f"   New priority: {updated_todo['priority']}")
+
+        # 6. Toggle completion
+        print("\n6. Toggling todo completion...")
+        toggled_todo = await client.toggle_todo(todo_to_update["id"])
+        status = "completed" if toggled_todo["completed"] else "pending"
+        print(f"🔄 Toggled todo to: {status}")
+
+        # 7. Get statistics
+        print("\n7. Getting statistics...")
+        stats = await client.get_stats()
+        print(f"📊 Total: {stats['total_todos']}")
+        print(f"✅ Completed: {stats['completed_todos']}")
+        print(f"⏳ Pending: {stats['pending_todos']}")
+
+        priority_lines = [
+            f"🎯 Priority {priority}: {count} todos"
+            for priority in range(1, 6)
+            if (count := stats.get(f"priority_{priority}", 0)) > 0
+        ]
+        if priority_lines:
+            print("\n".join(priority_lines))
+
+        # 8. Get specific todo
+        print("\n8. Getting specific todo...")
+        specific_todo = await client.get_todo(created_todos[0]["id"])
+        print(f"📋 Retrieved: {specific_todo['title']}")
+
+        # 9. Delete a todo
+        print("\n9. Deleting a todo...")
+        success = await client.delete_todo(created_todos[2]["id"])
+        if success:
+            print(f"🗑️ Deleted: {created_todos[2]['title']}")
+
+        # 10. Final statistics
+        print("\n10. Final statistics...")
+        final_stats = await client.get_stats()
+        print(f"📊 Final total: {final_stats['total_todos']} todos")
+
+        print("\n🎉 Demo workflow completed successfully!")
 
 
 async def concurrent_operations_demo():
     """Demonstrate concurrent API operations."""
-    client = TodoClient()
-
-    print("\n🔄 Concurrent Operations Demo")
-    print("=" * 35)
-
-    # Create multiple todos concurrently
-    tasks = []
-    for i in range(5):
-        task = client.create_todo(
-            title=f"Concurrent Todo {i + 1}",
-            description=f"Todo created concurrently #{i + 1}",
-            priority=(i % 5) + 1,
-        )
-        tasks.append(task)
+    async with TodoClient() as client:
+        print("\n🔄 Concurrent Operations Demo")
+        print("=" * 35)
+
+        # Create multiple todos concurrently
+        tasks = []
+        for i in range(5):
+            task = client.create_todo(
+                title=f"Concurrent Todo {i + 1}",
+                description=f"Todo created concurrently #{i + 1}",
+                priority=(i % 5) + 1,
+            )
+            tasks.append(task)
 
-    print("⚡ Creating 5 todos concurrently...")
-    start_time = datetime.now()
-    results = await asyncio.gather(*tasks)
-    end_time = datetime.now()
+        print("⚡ Creating 5 todos concurrently...")
+        start_time = datetime.now()
+        results = await asyncio.gather(*tasks)
+        end_time = datetime.now()
 
-    duration = (end_time - start_time).total_seconds()
-    print(f"✅ Created {len(results)} todos in {duration:.2f} seconds")
+        duration = (end_time - start_time).total_seconds()
+        print(f"✅ Created {len(results)} todos in {duration:.2f} seconds")
 
-    # Get stats to verify
-    stats = await client.get_stats()
-    print(f"📊 Total todos in system: {stats['total_todos']}")
+        # Get stats to verify
+        stats = await client.get_stats()
+        print(f"📊 Total todos in system: {stats['total_todos']}")
 
 
 if __name__ == "__main__":
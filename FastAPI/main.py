@@ -13,23 +13,32 @@ This module demonstrates FastAPI's key features including:
 
 import asyncio
 import logging
+import os
 import time
+from collections.abc import Iterable
 from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import lru_cache
+from itertools import count, islice
 from uuid import UUID, uuid4
 
-from fastapi import FastAPI, HTTPException, Query, status
+from fastapi import Depends, FastAPI, HTTPException, Query, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 from uvicorn import run
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
 
+# Artificial per-request latency in seconds (0 disables the simulated I/O)
+DEMO_LATENCY = float(os.getenv("DEMO_LATENCY", "0"))
+
 
 # Pydantic Models for Request/Response Validation
 class TodoBase(BaseModel):
@@ -83,10 +92,6 @@ class Todo(TodoBase):
     )
     updated_at: datetime | None = Field(None, description="Last update timestamp")
 
-    model_config = ConfigDict(
-        json_encoders={datetime: lambda v: v.isoformat(), UUID: lambda v: str(v)}
-    )
-
 
 class HealthResponse(BaseModel):
     """Health check response model."""
@@ -105,7 +110,172 @@ class ErrorResponse(BaseModel):
 
 
 # In-memory storage (in production, use a proper database)
-todos_storage: list[Todo] = []
+class InMemoryStorage:
+    """
+    Todo storage keyed by ID, with secondary indexes for filters and stats.
+
+    Each index bucket maps ID -> Todo. Priority buckets are indexed 1-5; slot 0
+    is unused. Every todo gets a sequence number when stored; a bucket that a
+    moved todo was appended to out of sequence is re-sorted the next time a
+    listing reads it, so filtered results follow storage order. Pages returned
+    by list_todos are memoized until the next change to storage membership or
+    bucket placement.
+    """
+
+    def __init__(self, page_cache_size: int = 128) -> None:
+        self.todos: dict[UUID, Todo] = {}
+        self.by_priority: list[dict[UUID, Todo]] = [{} for _ in range(6)]
+        self.by_completed: dict[bool, dict[UUID, Todo]] = {True: {}, False: {}}
+        self._seq: dict[UUID, int] = {}
+        self._next_seq = count()
+        self._unsorted_priority: set[int] = set()
+        self._unsorted_completed: set[bool] = set()
+        self._cached_page = lru_cache(maxsize=page_cache_size)(self._compute_page)
+
+    def _invalidate(self) -> None:
+        """Drop memoized pages after a change that can alter listing results."""
+        self._cached_page.cache_clear()
+
+    def __len__(self) -> int:
+        return len(self.todos)
+
+    def __contains__(self, todo_id: UUID) -> bool:
+        return todo_id in self.todos
+
+    def get(self, todo_id: UUID) -> Todo | None:
+        """Return the todo with the given ID, or None."""
+        return self.todos.get(todo_id)
+
+    def add(self, todo: Todo) -> None:
+        """Store a todo and register it in the secondary indexes."""
+        self.todos[todo.id] = todo
+        self._seq[todo.id] = next(self._next_seq)
+        self.by_priority[todo.priority][todo.id] = todo
+        self.by_completed[todo.completed][todo.id] = todo
+        self._invalidate()
+
+    def bulk_insert(self, todos: Iterable[Todo]) -> None:
+        """Store several todos at once."""
+        for todo in todos:
+            self.add(todo)
+
+    def remove(self, todo: Todo) -> None:
+        """Remove a todo from storage and the secondary indexes."""
+        del self.todos[todo.id]
+        del self._seq[todo.id]
+        del self.by_priority[todo.priority][todo.id]
+        del self.by_completed[todo.completed][todo.id]
+        self._invalidate()
+
+    def reindex(self, todo: Todo, old_priority: int, old_completed: bool) -> None:
+        """
+        Move a todo between index buckets after its priority or status changed.
+
+        The todo is appended to its new bucket; if that puts the bucket out of
+        storage order, the bucket is flagged for a lazy re-sort.
+        """
+        moved = False
+        if todo.priority != old_priority:
+            del self.by_priority[old_priority][todo.id]
+            if self._append(self.by_priority[todo.priority], todo):
+                self._unsorted_priority.add(todo.priority)
+            moved = True
+        if todo.completed != old_completed:
+            del self.by_completed[old_completed][todo.id]
+            if self._append(self.by_completed[todo.completed], todo):
+                self._unsorted_completed.add(todo.completed)
+            moved = True
+        if moved:
+            self._invalidate()
+
+    def _append(self, bucket: dict[UUID, Todo], todo: Todo) -> bool:
+        """Append a todo to a bucket, returning True if it landed out of order."""
+        out_of_order = bool(bucket) and (
+            self._seq[next(reversed(bucket))] > self._seq[todo.id]
+        )
+        bucket[todo.id] = todo
+        return out_of_order
+
+    def _ordered_bucket(
+        self,
+        index: list[dict[UUID, Todo]] | dict[bool, dict[UUID, Todo]],
+        unsorted: set[int] | set[bool],
+        key: int | bool,
+    ) -> dict[UUID, Todo]:
+        """Return index[key], first restoring storage order if it was flagged."""
+        if key in unsorted:
+            unsorted.discard(key)
+            index[key] = dict(
+                sorted(index[key].items(), key=lambda item: self._seq[item[0]])
+            )
+        return index[key]
+
+    def clear(self) -> None:
+        """Remove every todo from storage and the secondary indexes."""
+        self.todos.clear()
+        self._seq.clear()
+        self._unsorted_priority.clear()
+        self._unsorted_completed.clear()
+        for bucket in self.by_priority:
+            bucket.clear()
+        for bucket in self.by_completed.values():
+            bucket.clear()
+        self._invalidate()
+
+    def page_cache_info(self) -> tuple[int, int, int | None, int]:
+        """Return (hits, misses, maxsize, currsize) for the listing page cache."""
+        return self._cached_page.cache_info()
+
+    def list_todos(
+        self, completed: bool | None, priority: int | None, skip: int, limit: int
+    ) -> list[Todo]:
+        """
+        Return one page of todos matching the optional filters.
+
+        Cached pages hold references to the live Todo objects, so field edits
+        that do not move a todo between buckets are still reflected.
+        """
+        return list(self._cached_page(completed, priority, skip, limit))
+
+    def _compute_page(
+        self, completed: bool | None, priority: int | None, skip: int, limit: int
+    ) -> tuple[Todo, ...]:
+        """Scan the indexes for one page of matching todos."""
+        # Start from the smallest index bucket that satisfies a filter
+        if completed is not None and (
+            priority is None
+            or len(self.by_completed[completed]) < len(self.by_priority[priority])
+        ):
+            candidates = self._ordered_bucket(
+                self.by_completed, self._unsorted_completed, completed
+            )
+        elif priority is not None:
+            candidates = self._ordered_bucket(
+                self.by_priority, self._unsorted_priority, priority
+            )
+        else:
+            candidates = self.todos
+
+        # Apply remaining filters lazily; islice stops once the page is full
+        matches = (
+            todo
+            for todo in candidates.values()
+            if (completed is None or todo.completed == completed)
+            and (priority is None or todo.priority == priority)
+        )
+        return tuple(islice(matches, skip, skip + limit))
+
+
+todos_storage = InMemoryStorage()
+
+
+def get_storage() -> InMemoryStorage:
+    """Dependency providing the application's todo storage."""
+    return todos_storage
+
+
+# Serializes a whole page of todos to JSON in a single pydantic-core call
+TODOS_ADAPTER = TypeAdapter(list[Todo])
 
 
 # Custom exceptions
@@ -149,7 +319,7 @@ async def lifespan(app: FastAPI):
             updated_at=None,
         ),
     ]
-    todos_storage.extend(sample_todos)
+    todos_storage.bulk_insert(sample_todos)
     logger.info(f"📝 Initialized with {len(sample_todos)} sample todos")
 
     yield
@@ -174,6 +344,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -186,56 +357,84 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(
-    TrustedHostMiddleware,
-    allowed_hosts=["*"],  # In production, specify actual hosts
-)
+# Only restrict hosts when configured; allowing "*" would just add overhead
+trusted_hosts = [
+    host.strip() for host in os.getenv("TRUSTED_HOSTS", "").split(",") if host.strip()
+]
+if trusted_hosts and "*" not in trusted_hosts:
+    app.add_middleware(TrustedHostMiddleware, allowed_hosts=trusted_hosts)
 
 
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request, call_next):
     """Log all HTTP requests with timing information."""
-    start_time = time.time()
+    if not logger.isEnabledFor(logging.INFO):
+        return await call_next(request)
+
+    start_time = time.perf_counter()
 
     response = await call_next(request)
 
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
     logger.info(
-        f"📝 {request.method} {request.url.path} - "
-        f"{response.status_code} - {process_time:.4f}s"
+        "📝 %s %s - %s - %.4fs",
+        request.method,
+        request.url.path,
+        response.status_code,
+        process_time,
     )
 
     return response
 
 
 # Helper functions
-async def get_todo_by_id(todo_id: UUID) -> Todo:
+async def get_todo_by_id(todo_id: UUID, storage: InMemoryStorage) -> Todo:
     """Retrieve a todo by ID or raise 404."""
-    for todo in todos_storage:
-        if todo.id == todo_id:
-            return todo
-    raise TodoNotFoundError(todo_id)
+    todo = storage.get(todo_id)
+    if todo is None:
+        raise TodoNotFoundError(todo_id)
+    return todo
+
+
+def todo_response(todo: Todo, status_code: int = status.HTTP_200_OK) -> Response:
+    """Serialize a todo directly, skipping FastAPI's response re-validation."""
+    return Response(
+        todo.model_dump_json(), status_code=status_code, media_type="application/json"
+    )
 
 
 async def simulate_async_operation() -> None:
-    """Simulate an async operation (e.g., database call, API request)."""
-    await asyncio.sleep(0.1)  # Simulate I/O operation
+    """Simulate an async operation (e.g., database call, API request).
+
+    Only sleeps when DEMO_LATENCY is set, so regular runs have no added delay.
+    """
+    if DEMO_LATENCY > 0:
+        await asyncio.sleep(DEMO_LATENCY)  # Simulate I/O operation
 
 
 # API Routes
 
 
 @app.get("/health", response_model=HealthResponse, tags=["System"])
-async def health_check() -> HealthResponse:
+async def health_check(
+    storage: InMemoryStorage = Depends(get_storage),
+) -> ORJSONResponse:
     """
     Health check endpoint for monitoring and load balancers.
 
-    Returns system status and basic metrics.
+    Returns system status and basic metrics. The payload is built directly
+    to skip model validation on this frequently polled endpoint;
+    HealthResponse still documents its shape.
     """
-    await simulate_async_operation()
-
-    return HealthResponse(total_todos=len(todos_storage))
+    return ORJSONResponse(
+        {
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            "version": "1.0.0",
+            "total_todos": len(storage),
+        }
+    )
 
 
 @app.get("/", tags=["System"])
@@ -244,7 +443,12 @@ async def root() -> dict[str, str]:
     return {"message": "Welcome to FastAPI Demo!", "docs": "/docs", "health": "/health"}
 
 
-@app.get("/todos", response_model=list[Todo], tags=["Todos"])
+@app.get(
+    "/todos",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": list[Todo]}},
+    tags=["Todos"],
+)
 async def get_todos(
     completed: bool | None = Query(None, description="Filter by completion status"),
     priority: int | None = Query(
@@ -254,7 +458,8 @@ async def get_todos(
         10, ge=1, le=100, description="Maximum number of todos to return"
     ),
     skip: int = Query(0, ge=0, description="Number of todos to skip"),
-) -> list[Todo]:
+    storage: InMemoryStorage = Depends(get_storage),
+) -> Response:
     """
     Retrieve todos with optional filtering and pagination.
 
@@ -265,23 +470,15 @@ async def get_todos(
     """
     await simulate_async_operation()
 
-    # Apply filters
-    filtered_todos = todos_storage
-
-    if completed is not None:
-        filtered_todos = [
-            todo for todo in filtered_todos if todo.completed == completed
-        ]
+    page = storage.list_todos(completed, priority, skip, limit)
 
-    if priority is not None:
-        filtered_todos = [todo for todo in filtered_todos if todo.priority == priority]
-
-    # Apply pagination
-    return filtered_todos[skip : skip + limit]
+    return Response(TODOS_ADAPTER.dump_json(page), media_type="application/json")
 
 
 @app.get("/todos/stats", tags=["Analytics"])
-async def get_todo_stats() -> dict[str, int]:
+async def get_todo_stats(
+    storage: InMemoryStorage = Depends(get_storage),
+) -> dict[str, int]:
     """
     Get statistics about todos.
 
@@ -289,39 +486,47 @@ async def get_todo_stats() -> dict[str, int]:
     """
     await simulate_async_operation()
 
-    total = len(todos_storage)
-    completed = len([todo for todo in todos_storage if todo.completed])
+    # Counts come straight from the index bucket sizes
+    total = len(storage)
+    completed = len(storage.by_completed[True])
     pending = total - completed
 
-    # Priority breakdown
-    priority_stats = {}
-    for priority in range(1, 6):
-        count = len([todo for todo in todos_storage if todo.priority == priority])
-        priority_stats[f"priority_{priority}"] = count
-
     return {
         "total_todos": total,
         "completed_todos": completed,
         "pending_todos": pending,
-        **priority_stats,
+        **{f"priority_{p}": len(storage.by_priority[p]) for p in range(1, 6)},
     }
 
 
-@app.get("/todos/{todo_id}", response_model=Todo, tags=["Todos"])
-async def get_todo(todo_id: UUID) -> Todo:
+@app.get(
+    "/todos/{todo_id}",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": Todo}},
+    tags=["Todos"],
+)
+async def get_todo(
+    todo_id: UUID, storage: InMemoryStorage = Depends(get_storage)
+) -> Response:
     """
     Retrieve a specific todo by ID.
 
     Returns the todo item if found, otherwise returns 404.
     """
     await simulate_async_operation()
-    return await get_todo_by_id(todo_id)
+    return todo_response(await get_todo_by_id(todo_id, storage))
 
 
 @app.post(
-    "/todos", response_model=Todo, status_code=status.HTTP_201_CREATED, tags=["Todos"]
+    "/todos",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: {"model": Todo}},
+    tags=["Todos"],
 )
-async def create_todo(todo: TodoCreate) -> Todo:
+async def create_todo(
+    todo: TodoCreate, storage: InMemoryStorage = Depends(get_storage)
+) -> Response:
     """
     Create a new todo item.
 
@@ -329,15 +534,33 @@ async def create_todo(todo: TodoCreate) -> Todo:
     """
     await simulate_async_operation()
 
-    new_todo = Todo(**todo.model_dump())
-    todos_storage.append(new_todo)
+    # TodoCreate is already validated, so skip re-validating the same fields
+    new_todo = Todo.model_construct(
+        id=uuid4(),
+        created_at=datetime.now(),
+        updated_at=None,
+        title=todo.title,
+        description=todo.description,
+        priority=todo.priority,
+        completed=todo.completed,
+    )
+    storage.add(new_todo)
 
     logger.info(f"✅ Created new todo: {new_todo.title} (ID: {new_todo.id})")
-    return new_todo
+    return todo_response(new_todo, status.HTTP_201_CREATED)
 
 
-@app.put("/todos/{todo_id}", response_model=Todo, tags=["Todos"])
-async def update_todo(todo_id: UUID, todo_update: TodoUpdate) -> Todo:
+@app.put(
+    "/todos/{todo_id}",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": Todo}},
+    tags=["Todos"],
+)
+async def update_todo(
+    todo_id: UUID,
+    todo_update: TodoUpdate,
+    storage: InMemoryStorage = Depends(get_storage),
+) -> Response:
     """
     Update an existing todo item.
 
@@ -346,21 +569,30 @@ async def update_todo(todo_id: UUID, todo_update: TodoUpdate) -> Todo:
     """
     await simulate_async_operation()
 
-    existing_todo = await get_todo_by_id(todo_id)
+    existing_todo = await get_todo_by_id(todo_id, storage)
+    old_priority, old_completed = existing_todo.priority, existing_todo.completed
 
-    # Update only provided fields
-    update_data = todo_update.model_dump(exclude_unset=True)
+    # Update only provided fields; explicit nulls are ignored except for the
+    # description, the only field a Todo allows to be None
+    update_data = {
+        field: value
+        for field, value in todo_update.model_dump(exclude_unset=True).items()
+        if value is not None or field == "description"
+    }
     for field, value in update_data.items():
         setattr(existing_todo, field, value)
 
+    storage.reindex(existing_todo, old_priority, old_completed)
     existing_todo.updated_at = datetime.now()
 
     logger.info(f"📝 Updated todo: {existing_todo.title} (ID: {todo_id})")
-    return existing_todo
+    return todo_response(existing_todo)
 
 
 @app.delete("/todos/{todo_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Todos"])
-async def delete_todo(todo_id: UUID) -> None:
+async def delete_todo(
+    todo_id: UUID, storage: InMemoryStorage = Depends(get_storage)
+) -> None:
     """
     Delete a todo item by ID.
 
@@ -368,14 +600,21 @@ async def delete_todo(todo_id: UUID) -> None:
     """
     await simulate_async_operation()
 
-    todo_to_delete = await get_todo_by_id(todo_id)
-    todos_storage.remove(todo_to_delete)
+    todo_to_delete = await get_todo_by_id(todo_id, storage)
+    storage.remove(todo_to_delete)
 
     logger.info(f"🗑️ Deleted todo: {todo_to_delete.title} (ID: {todo_id})")
 
 
-@app.patch("/todos/{todo_id}/toggle", response_model=Todo, tags=["Todos"])
-async def toggle_todo_completion(todo_id: UUID) -> Todo:
+@app.patch(
+    "/todos/{todo_id}/toggle",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": Todo}},
+    tags=["Todos"],
+)
+async def toggle_todo_completion(
+    todo_id: UUID, storage: InMemoryStorage = Depends(get_storage)
+) -> Response:
     """
     Toggle the completion status of a todo item.
 
@@ -383,14 +622,16 @@ async def toggle_todo_completion(todo_id: UUID) -> Todo:
     """
     await simulate_async_operation()
 
-    todo = await get_todo_by_id(todo_id)
-    todo.completed = not todo.completed
+    todo = await get_todo_by_id(todo_id, storage)
+    old_completed = todo.completed
+    todo.completed = not old_completed
+    storage.reindex(todo, todo.priority, old_completed)
     todo.updated_at = datetime.now()
 
     status_text = "completed" if todo.completed else "reopened"
     logger.info(f"🔄 {status_text.title()} todo: {todo.title} (ID: {todo_id})")
 
-    return todo
+    return todo_response(todo)
 
 
 # Error handlers
@@ -404,4 +645,17 @@ if __name__ == "__main__":
     """Run the application with uvicorn."""
     logger.info("🚀 Starting FastAPI Demo Application...")
 
-    run("main:app", host="0.0.0.0", port=8000, reload=True, log_level="info")
+    if os.getenv("RELOAD", "").lower() in ("1", "true", "yes"):
+        # Development: single process with auto-reload
+        run("main:app", host="0.0.0.0", port=8000, reload=True, log_level="info")
+    else:
+        # Storage is in-memory and per-process, so keep one worker by default
+        run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="auto",  # uvloop when installed, asyncio otherwise (Windows)
+            http="httptools",
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+            log_level="warning",
+        )
@@ -5,13 +5,24 @@ Pytest configuration and fixtures for FastAPI tests.
 import pytest
 from fastapi.testclient import TestClient
 
-from main import Todo, app, todos_storage
+from main import InMemoryStorage, Todo, app, get_storage, todos_storage
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client():
-    """Create a test client for the FastAPI application."""
-    return TestClient(app)
+    """
+    Create a test client shared by all tests in a module.
+
+    State is isolated per test by clear_todos_storage, not by a new client.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session", autouse=True)
+def openapi_schema():
+    """Build the OpenAPI schema once; FastAPI reuses app.openapi_schema after."""
+    return app.openapi()
 
 
 @pytest.fixture
@@ -36,6 +47,16 @@ def sample_todo():
     )
 
 
+@pytest.fixture(autouse=True)
+def skip_simulated_latency(monkeypatch):
+    """Disable simulated I/O latency, even when DEMO_LATENCY is set."""
+
+    async def _noop() -> None:
+        return None
+
+    monkeypatch.setattr("main.simulate_async_operation", _noop)
+
+
 @pytest.fixture(autouse=True)
 def clear_todos_storage():
     """Clear todos storage before each test."""
@@ -45,7 +66,31 @@ def clear_todos_storage():
 
 
 @pytest.fixture
-def populated_storage(sample_todo):
-    """Populate storage with sample data for testing."""
-    todos_storage.append(sample_todo)
+def storage_override():
+    """Inject a fresh storage into the app for one test."""
+    storage = InMemoryStorage()
+    app.dependency_overrides[get_storage] = lambda: storage
+    yield storage
+    app.dependency_overrides.pop(get_storage, None)
+
+
+@pytest.fixture
+def seed_todos(storage_override):
+    """Return a helper that inserts todos into the injected storage, skipping HTTP."""
+
+    def _seed(count: int, **overrides) -> list[Todo]:
+        todos = [
+            Todo.model_construct(**{"title": f"Todo {i}", "priority": 1, **overrides})
+            for i in range(count)
+        ]
+        storage_override.bulk_insert(todos)
+        return todos
+
+    return _seed
+
+
+@pytest.fixture
+def populated_storage(storage_override, sample_todo):
+    """Add the sample todo to the injected storage, as seed_todos does."""
+    storage_override.add(sample_todo)
     return sample_todo
@@ -2,24 +2,67 @@
 Comprehensive tests for the FastAPI Todo application.
 """
 
-from uuid import uuid4
+import asyncio
+from typing import Final
 
+import httpx
+import orjson
 import pytest
 from fastapi import status
 
+from main import app
+
+# Well-formed ID that no test ever creates
+FAKE_ID: Final = "00000000-0000-0000-0000-000000000001"
+
+# Request payloads shared across tests (never mutated)
+INVALID_TODO_PAYLOAD: Final = {
+    "title": "",  # Empty title should fail
+    "priority": 10,  # Priority > 5 should fail
+}
+UPDATE_TODO_PAYLOAD: Final = {"title": "Updated Title", "completed": True}
+UPDATE_TITLE_PAYLOAD: Final = {"title": "Updated Title"}
+NULL_FIELDS_PAYLOAD: Final = {
+    "title": None,
+    "description": None,
+    "priority": None,
+    "completed": None,
+}
+EMPTY_TITLE_PAYLOAD: Final = {"title": ""}
+BLANK_TITLE_PAYLOAD: Final = {"title": "   "}
+LONG_TITLE_PAYLOAD: Final = {"title": "x" * 201}
+LOW_PRIORITY_PAYLOAD: Final = {"title": "Test", "priority": 0}
+HIGH_PRIORITY_PAYLOAD: Final = {"title": "Test", "priority": 6}
+VALID_PRIORITY_PAYLOAD: Final = {"title": "Test", "priority": 3}
+
+# Expected body of /todos/stats with no todos, in the endpoint's key order
+EMPTY_STATS: Final = orjson.dumps(
+    {
+        "total_todos": 0,
+        "completed_todos": 0,
+        "pending_todos": 0,
+        **{f"priority_{p}": 0 for p in range(1, 6)},
+    }
+)
+
+
+def check_ok(response, code=status.HTTP_200_OK, **expected):
+    """Assert the status code and a subset of fields, returning the body."""
+    assert response.status_code == code
+    data = orjson.loads(response.content)
+    # List bodies have no fields to compare, only the status code
+    if expected:
+        assert expected.items() <= data.items()
+    return data
+
 
 class TestHealthEndpoint:
     """Test health check functionality."""
 
     def test_health_check(self, client):
         """Test health endpoint returns correct status."""
-        response = client.get("/health")
-
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = check_ok(client.get("/health"), status="healthy", version="1.0.0")
 
-        assert data["status"] == "healthy"
-        assert data["version"] == "1.0.0"
         assert "timestamp" in data
         assert "total_todos" in data
 
@@ -29,14 +72,12 @@ class TestRootEndpoint:
 
     def test_root_endpoint(self, client):
         """Test root endpoint returns welcome message."""
-        response = client.get("/")
-
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-
-        assert data["message"] == "Welcome to FastAPI Demo!"
-        assert data["docs"] == "/docs"
-        assert data["health"] == "/health"
+        check_ok(
+            client.get("/"),
+            message="Welcome to FastAPI Demo!",
+            docs="/docs",
+            health="/health",
+        )
 
 
 class TestTodosCRUD:
@@ -47,30 +88,19 @@ class TestTodosCRUD:
         response = client.get("/todos")
 
         assert response.status_code == status.HTTP_200_OK
-        assert response.json() == []
+        assert response.content == b"[]"
 
     def test_create_todo(self, client, sample_todo_data):
         """Test creating a new todo."""
         response = client.post("/todos", json=sample_todo_data)
+        data = check_ok(response, code=status.HTTP_201_CREATED, **sample_todo_data)
 
-        assert response.status_code == status.HTTP_201_CREATED
-        data = response.json()
-
-        assert data["title"] == sample_todo_data["title"]
-        assert data["description"] == sample_todo_data["description"]
-        assert data["priority"] == sample_todo_data["priority"]
-        assert data["completed"] == sample_todo_data["completed"]
         assert "id" in data
         assert "created_at" in data
 
     def test_create_todo_validation_error(self, client):
         """Test creating todo with validation errors."""
-        invalid_data = {
-            "title": "",  # Empty title should fail
-            "priority": 10,  # Priority > 5 should fail
-        }
-
-        response = client.post("/todos", json=invalid_data)
+        response = client.post("/todos", json=INVALID_TODO_PAYLOAD)
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
     def test_get_todo_by_id(self, client, populated_storage):
@@ -78,57 +108,58 @@ class TestTodosCRUD:
         todo_id = str(populated_storage.id)
         response = client.get(f"/todos/{todo_id}")
 
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-
-        assert data["id"] == todo_id
-        assert data["title"] == populated_storage.title
+        check_ok(response, id=todo_id, title=populated_storage.title)
 
     def test_get_nonexistent_todo(self, client):
         """Test retrieving a todo that doesn't exist."""
-        fake_id = str(uuid4())
-        response = client.get(f"/todos/{fake_id}")
+        response = client.get(f"/todos/{FAKE_ID}")
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_update_todo(self, client, populated_storage):
         """Test updating an existing todo."""
         todo_id = str(populated_storage.id)
-        update_data = {"title": "Updated Title", "completed": True}
+        response = client.put(f"/todos/{todo_id}", json=UPDATE_TODO_PAYLOAD)
+        data = check_ok(response, **UPDATE_TODO_PAYLOAD)
 
-        response = client.put(f"/todos/{todo_id}", json=update_data)
+        assert "updated_at" in data
 
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+    def test_update_todo_with_null_fields(self, client, populated_storage):
+        """Test that explicit nulls leave required fields and indexes intact."""
+        todo_id = str(populated_storage.id)
+        response = client.put(f"/todos/{todo_id}", json=NULL_FIELDS_PAYLOAD)
+
+        check_ok(
+            response,
+            title=populated_storage.title,
+            description=None,
+            priority=populated_storage.priority,
+            completed=populated_storage.completed,
+        )
+        stats = check_ok(client.get("/todos/stats"))
+        assert stats[f"priority_{populated_storage.priority}"] == 1
 
-        assert data["title"] == "Updated Title"
-        assert data["completed"] is True
-        assert "updated_at" in data
+        response = client.delete(f"/todos/{todo_id}")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
 
     def test_update_nonexistent_todo(self, client):
         """Test updating a todo that doesn't exist."""
-        fake_id = str(uuid4())
-        update_data = {"title": "Updated Title"}
-
-        response = client.put(f"/todos/{fake_id}", json=update_data)
+        response = client.put(f"/todos/{FAKE_ID}", json=UPDATE_TITLE_PAYLOAD)
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
-    def test_delete_todo(self, client, populated_storage):
+    def test_delete_todo(self, client, populated_storage, storage_override):
         """Test deleting an existing todo."""
         todo_id = str(populated_storage.id)
 
         response = client.delete(f"/todos/{todo_id}")
         assert response.status_code == status.HTTP_204_NO_CONTENT
 
-        # Verify todo is deleted
-        get_response = client.get(f"/todos/{todo_id}")
-        assert get_response.status_code == status.HTTP_404_NOT_FOUND
+        # Verify todo is deleted (404 over HTTP is covered separately)
+        assert populated_storage.id not in storage_override
 
     def test_delete_nonexistent_todo(self, client):
         """Test deleting a todo that doesn't exist."""
-        fake_id = str(uuid4())
-
-        response = client.delete(f"/todos/{fake_id}")
+        response = client.delete(f"/todos/{FAKE_ID}")
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_toggle_todo_completion(self, client, populated_storage):
@@ -137,75 +168,121 @@ class TestTodosCRUD:
         original_status = populated_storage.completed
 
         response = client.patch(f"/todos/{todo_id}/toggle")
+        data = check_ok(response, completed=not original_status)
 
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-
-        assert data["completed"] != original_status
         assert "updated_at" in data
 
 
 class TestTodosFiltering:
     """Test todo filtering and pagination."""
 
-    def test_filter_by_completion_status(self, client):
+    def test_filter_by_completion_status(self, client, seed_todos):
         """Test filtering todos by completion status."""
-        # Create test todos
-        completed_todo = {"title": "Completed Todo", "completed": True}
-        pending_todo = {"title": "Pending Todo", "completed": False}
-
-        client.post("/todos", json=completed_todo)
-        client.post("/todos", json=pending_todo)
+        seed_todos(1, title="Completed Todo", completed=True)
+        seed_todos(1, title="Pending Todo", completed=False)
 
         # Test filtering completed todos
-        response = client.get("/todos?completed=true")
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = check_ok(client.get("/todos?completed=true"))
         assert len(data) == 1
         assert data[0]["completed"] is True
 
         # Test filtering pending todos
-        response = client.get("/todos?completed=false")
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = check_ok(client.get("/todos?completed=false"))
         assert len(data) == 1
         assert data[0]["completed"] is False
 
-    def test_filter_by_priority(self, client):
+    def test_filter_by_priority(self, client, seed_todos):
         """Test filtering todos by priority level."""
-        # Create todos with different priorities
-        high_priority = {"title": "High Priority", "priority": 5}
-        low_priority = {"title": "Low Priority", "priority": 1}
-
-        client.post("/todos", json=high_priority)
-        client.post("/todos", json=low_priority)
+        seed_todos(1, title="High Priority", priority=5)
+        seed_todos(1, title="Low Priority", priority=1)
 
         # Test filtering by priority
-        response = client.get("/todos?priority=5")
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = check_ok(client.get("/todos?priority=5"))
         assert len(data) == 1
         assert data[0]["priority"] == 5
 
-    def test_pagination(self, client):
+    def test_pagination(self, client, seed_todos):
         """Test todo pagination."""
-        # Create multiple todos
-        for i in range(15):
-            todo_data = {"title": f"Todo {i}", "priority": 1}
-            client.post("/todos", json=todo_data)
+        seed_todos(15)
 
         # Test default limit
-        response = client.get("/todos")
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = check_ok(client.get("/todos"))
         assert len(data) == 10  # Default limit
 
         # Test custom limit and skip
-        response = client.get("/todos?limit=5&skip=10")
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = check_ok(client.get("/todos?limit=5&skip=10"))
         assert len(data) == 5
 
+    def test_repeated_listing_is_cached(self, client, seed_todos, storage_override):
+        """Test an identical repeated query is served from the page cache."""
+        seed_todos(3, priority=2)
+        first = check_ok(client.get("/todos?priority=2"))
+        hits = storage_override.page_cache_info().hits
+
+        assert check_ok(client.get("/todos?priority=2")) == first
+        assert storage_override.page_cache_info().hits == hits + 1
+
+    def test_cached_listing_reflects_changes(self, client, seed_todos):
+        """Test repeated filtered listings stay correct after mutations."""
+        todo = seed_todos(1, priority=2)[0]
+        assert check_ok(client.get("/todos?completed=true")) == []
+
+        check_ok(client.patch(f"/todos/{todo.id}/toggle"), completed=True)
+        data = check_ok(client.get("/todos?completed=true"))
+        assert [item["id"] for item in data] == [str(todo.id)]
+
+        check_ok(client.put(f"/todos/{todo.id}", json=UPDATE_TITLE_PAYLOAD))
+        data = check_ok(client.get("/todos?completed=true"))
+        assert data[0]["title"] == UPDATE_TITLE_PAYLOAD["title"]
+
+        response = client.delete(f"/todos/{todo.id}")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert check_ok(client.get("/todos?completed=true")) == []
+
+    def test_filtered_listing_keeps_storage_order(self, client, seed_todos):
+        """Test filtered results follow storage order after todos move buckets."""
+        t0, _, t2 = seed_todos(3, priority=3)
+        check_ok(client.patch(f"/todos/{t2.id}/toggle"), completed=True)
+        check_ok(client.patch(f"/todos/{t0.id}/toggle"), completed=True)
+        expected = [str(t0.id), str(t2.id)]
+
+        data = check_ok(client.get("/todos?priority=3&completed=true"))
+        assert [item["id"] for item in data] == expected
+
+        # Enough unrelated completed todos to change which bucket is scanned
+        seed_todos(3, priority=1, completed=True)
+        data = check_ok(client.get("/todos?priority=3&completed=true"))
+        assert [item["id"] for item in data] == expected
+
+        data = check_ok(client.get("/todos?priority=3&completed=true&skip=1"))
+        assert [item["id"] for item in data] == expected[1:]
+
+    def test_toggle_does_not_rebuild_buckets(
+        self, client, seed_todos, storage_override
+    ):
+        """Test a toggle in a large store leaves every index bucket in place."""
+        todo = seed_todos(1000, priority=3)[0]
+        seed_todos(1000, priority=4, completed=True)
+
+        def buckets():
+            return [
+                *storage_override.by_priority,
+                *storage_override.by_completed.values(),
+            ]
+
+        before = buckets()
+        completed_bucket = storage_override.by_completed[True]
+
+        check_ok(client.patch(f"/todos/{todo.id}/toggle"), completed=True)
+        assert all(old is new for old, new in zip(before, buckets(), strict=True))
+
+        # Only the bucket the todo joined is re-sorted, and only when listed
+        data = check_ok(client.get("/todos?completed=true&limit=1"))
+        assert data[0]["id"] == str(todo.id)
+        assert storage_override.by_completed[True] is not completed_bucket
+        rebuilt = [old is not new for old, new in zip(before, buckets(), strict=True)]
+        assert rebuilt.count(True) == 1
+
 
 class TestTodoStats:
     """Test todo statistics endpoint."""
@@ -215,65 +292,50 @@ class TestTodoStats:
         response = client.get("/todos/stats")
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-
-        assert data["total_todos"] == 0
-        assert data["completed_todos"] == 0
-        assert data["pending_todos"] == 0
+        assert response.content == EMPTY_STATS
 
-    def test_get_stats_with_data(self, client):
+    def test_get_stats_with_data(self, client, seed_todos):
         """Test stats with sample data."""
-        # Create test todos
-        todos = [
-            {"title": "Todo 1", "priority": 1, "completed": True},
-            {"title": "Todo 2", "priority": 2, "completed": False},
-            {"title": "Todo 3", "priority": 1, "completed": False},
-        ]
-
-        for todo in todos:
-            client.post("/todos", json=todo)
-
-        response = client.get("/todos/stats")
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        seed_todos(1, priority=1, completed=True)
+        seed_todos(1, priority=2, completed=False)
+        seed_todos(1, priority=1, completed=False)
 
-        assert data["total_todos"] == 3
-        assert data["completed_todos"] == 1
-        assert data["pending_todos"] == 2
-        assert data["priority_1"] == 2
-        assert data["priority_2"] == 1
+        check_ok(
+            client.get("/todos/stats"),
+            total_todos=3,
+            completed_todos=1,
+            pending_todos=2,
+            priority_1=2,
+            priority_2=1,
+        )
 
 
 class TestValidation:
     """Test Pydantic model validation."""
 
-    def test_title_validation(self, client):
+    @pytest.mark.parametrize(
+        "payload",
+        [EMPTY_TITLE_PAYLOAD, BLANK_TITLE_PAYLOAD, LONG_TITLE_PAYLOAD],
+        ids=["empty", "whitespace", "too-long"],
+    )
+    def test_title_validation(self, client, payload):
         """Test title field validation."""
-        # Test empty title
-        response = client.post("/todos", json={"title": ""})
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
-
-        # Test whitespace-only title
-        response = client.post("/todos", json={"title": "   "})
+        response = client.post("/todos", json=payload)
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
-        # Test title too long
-        long_title = "x" * 201
-        response = client.post("/todos", json={"title": long_title})
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
-
-    def test_priority_validation(self, client):
+    @pytest.mark.parametrize(
+        "payload",
+        [LOW_PRIORITY_PAYLOAD, HIGH_PRIORITY_PAYLOAD],
+        ids=["too-low", "too-high"],
+    )
+    def test_priority_validation(self, client, payload):
         """Test priority field validation."""
-        # Test priority too low
-        response = client.post("/todos", json={"title": "Test", "priority": 0})
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
-
-        # Test priority too high
-        response = client.post("/todos", json={"title": "Test", "priority": 6})
+        response = client.post("/todos", json=payload)
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
-        # Test valid priority
-        response = client.post("/todos", json={"title": "Test", "priority": 3})
+    def test_valid_priority(self, client):
+        """Test that an in-range priority is accepted."""
+        response = client.post("/todos", json=VALID_PRIORITY_PAYLOAD)
         assert response.status_code == status.HTTP_201_CREATED
 
 
@@ -281,28 +343,32 @@ class TestAsyncBehavior:
     """Test async behavior and concurrent operations."""
 
     @pytest.mark.asyncio
-    async def test_concurrent_requests(self, client):
+    async def test_concurrent_requests(self):
         """Test handling multiple concurrent requests."""
-
-        # Create multiple todos concurrently using the sync client
-        def create_todo_sync(i):
-            todo_data = {"title": f"Concurrent Todo {i}", "priority": 1}
-            return client.post("/todos", json=todo_data)
-
-        # Create todos concurrently (simulating concurrent requests)
-        responses = []
-        for i in range(5):
-            response = create_todo_sync(i)
-            responses.append(response)
-
-        # All requests should succeed
-        for response in responses:
-            assert response.status_code == status.HTTP_201_CREATED
-
-        # Verify all todos were created
-        response = client.get("/todos")
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as async_client:
+            # Issue all creates at once on the event loop
+            responses = await asyncio.gather(
+                *(
+                    async_client.post(
+                        "/todos", json={"title": f"Concurrent Todo {i}", "priority": 1}
+                    )
+                    for i in range(5)
+                )
+            )
+
+            # All requests should succeed
+            assert all(
+                response.status_code == status.HTTP_201_CREATED
+                for response in responses
+            )
+
+            # Verify all todos were created
+            response = await async_client.get("/todos")
+
+        data = check_ok(response)
         assert len(data) == 5
 
 
@@ -334,20 +400,17 @@ class TestOpenAPIDocumentation:
 
     def test_openapi_schema(self, client):
         """Test OpenAPI schema generation."""
-        response = client.get("/openapi.json")
-        assert response.status_code == status.HTTP_200_OK
-
-        schema = response.json()
+        schema = check_ok(client.get("/openapi.json"))
         assert "openapi" in schema
         assert "info" in schema
         assert schema["info"]["title"] == "FastAPI Demo Application"
 
     def test_swagger_ui(self, client):
         """Test Swagger UI accessibility."""
-        response = client.get("/docs")
+        response = client.head("/docs")
         assert response.status_code == status.HTTP_200_OK
 
     def test_redoc_ui(self, client):
         """Test ReDoc UI accessibility."""
-        response = client.get("/redoc")
+        response = client.head("/redoc")
         assert response.status_code == status.HTTP_200_OK